@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""Compatibility wrapper: the converter lives in the convert_tests package."""
+
+import sys
+
+from convert_tests import main
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "src", mode="vitest")
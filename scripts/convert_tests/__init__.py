@@ -0,0 +1,283 @@
+"""Convert plain it() blocks in *.spec.ts files to it.effect() blocks.
+
+Rewrites each `it(name, () => { ... })` into
+`it.effect(name, () => Effect.gen(function* () { ... }))` and fixes the
+vitest/effect import lines accordingly. Two modes share all of the
+machinery: "simple" only touches plain arrow bodies, "vitest" also picks
+up the `async` variants. Idempotent: files that already use `it.effect(`
+are skipped.
+"""
+
+import json
+import mmap
+import os
+import re
+import shutil
+import subprocess
+from functools import lru_cache, partial
+from multiprocessing import Pool
+
+_CACHE_FILE = ".convert-tests-cache.json"
+
+# match only the it() header; the body is found by a linear brace walk in
+# _find_block_end, which cannot backtrack the way a nested-quantifier
+# body pattern can
+_IT_HEADER_RES = {
+    "simple": re.compile(rb"^([ \t]*)it\(([^,]+),\s*\(\)\s*=>\s*\{", re.MULTILINE),
+    "vitest": re.compile(
+        rb"^([ \t]*)it\(([^,]+),\s*(?:async\s*)?\(\)\s*=>\s*\{", re.MULTILINE
+    ),
+}
+_VITEST_IMPORT_RE = re.compile(
+    rb"^import\s*\{([^}]*)\}\s*from\s*['\"]vitest['\"];?", re.MULTILINE
+)
+_EFFECT_IMPORT_RE = re.compile(
+    rb"^import\s*\{([^}]*)\}\s*from\s*['\"]effect['\"];?", re.MULTILINE
+)
+_INDENT_RE = re.compile(rb"^[ \t]*(?=\S)", re.MULTILINE)
+_BLANK_LINE_RE = re.compile(rb"^[ \t]+$", re.MULTILINE)
+_IT_SPECIFIER_RE = re.compile(rb"\bit\b")
+_IMPORT_LINE_RE = re.compile(rb"^import\b[^\n]*", re.MULTILINE)
+_LEADING_COMMENT_RE = re.compile(rb"\A(?:\s*(?://[^\n]*|/\*.*?\*/))*\s*", re.DOTALL)
+_DOUBLE_COMMA_RE = re.compile(rb",\s*,")
+
+_EFFECT_VITEST_IMPORT = b"import { it } from '@effect/vitest'"
+
+
+def _indent_body(test_body: bytes, prefix: bytes) -> bytes:
+    # both subs run inside the regex engine, so re-indenting even a long
+    # property-test body never enters a Python-level loop
+    body = _BLANK_LINE_RE.sub(b"", test_body.strip(b"\n"))
+    return _INDENT_RE.sub(prefix, body)
+
+
+def _find_block_end(content: "bytes | memoryview", start: int) -> int:
+    # linear brace-depth walk: O(n) worst case where the old nested-quantifier
+    # body pattern could backtrack exponentially on pathological files
+    depth = 1
+    i = start
+    n = len(content)
+    while i < n and depth:
+        c = content[i]
+        if c == 0x7B:  # {
+            depth += 1
+        elif c == 0x7D:  # }
+            depth -= 1
+        i += 1
+    return i if depth == 0 else -1
+
+
+@lru_cache(maxsize=16)
+def _effect_template(indent: bytes) -> "tuple[bytes, bytes, bytes, bytes]":
+    # a file only ever uses a handful of indent levels, so the assembled
+    # template fragments are cached instead of re-formatted per match
+    return (
+        indent + b"it.effect(",
+        b", () =>\n" + indent + b"  Effect.gen(function* () {\n",
+        b"\n" + indent + b"  })\n" + indent + b")",
+        indent + b"  ",
+    )
+
+
+def _build_effect(indent: bytes, test_name: bytes, test_body: bytes) -> bytes:
+    head, mid, tail, body_prefix = _effect_template(indent)
+    return head + test_name + mid + _indent_body(test_body, body_prefix) + tail
+
+
+def _rewrite_vitest_import(match):
+    names = _IT_SPECIFIER_RE.sub(b"", match.group(1), count=1)
+    names = _DOUBLE_COMMA_RE.sub(b",", names).strip(b" \t,")
+    if not names:
+        return _EFFECT_VITEST_IMPORT
+    return b"import { %b } from 'vitest'\n%b" % (names, _EFFECT_VITEST_IMPORT)
+
+
+def _rewrite_effect_import(match):
+    if b"Effect" in match.group(1):
+        return match.group(0)
+    return match.group(0).replace(b"{", b"{ Effect,", 1)
+
+
+def fix_imports(content: bytes) -> bytes:
+    # bound the rewrite by the import block itself: the subs only ever see
+    # the prefix ending at the last top-level import in the first 4 KiB, so
+    # a leading comment or blank line cannot hide the imports from them
+    first_import = None
+    split = 0
+    for match in _IMPORT_LINE_RE.finditer(content, 0, 4096):
+        if first_import is None:
+            first_import = match.start()
+        split = match.end()
+    header, body = content[:split], content[split:]
+    header = _VITEST_IMPORT_RE.sub(_rewrite_vitest_import, header, count=1)
+    header, found = _EFFECT_IMPORT_RE.subn(_rewrite_effect_import, header, count=1)
+    if not found:
+        line = b"import { Effect } from 'effect'\n"
+        if first_import is not None:
+            # the subs above only touch import lines, so the offset of the
+            # first one is still valid in the rewritten header
+            header = header[:first_import] + line + header[first_import:]
+        else:
+            # no imports at all: place the new one after any leading comment
+            pos = _LEADING_COMMENT_RE.match(body).end()
+            body = body[:pos] + line + body[pos:]
+    return header + body
+
+
+def convert(content: "bytes | memoryview", mode: str = "vitest") -> "bytes | memoryview":
+    # assemble via header search + brace walk and one join: no per-match
+    # callback dispatch and no intermediate strings
+    header_re = _IT_HEADER_RES[mode]
+    parts = []
+    pos = 0
+    changed = False
+    while True:
+        match = header_re.search(content, pos)
+        if match is None:
+            break
+        end = _find_block_end(content, match.end())
+        if end < 0 or content[end : end + 1] != b")":
+            parts.append(content[pos : match.end()])
+            pos = match.end()
+            continue
+        parts.append(content[pos : match.start()])
+        parts.append(
+            _build_effect(match.group(1), match.group(2), bytes(content[match.end() : end - 1]))
+        )
+        pos = end + 1
+        changed = True
+    if not changed:
+        return content
+    parts.append(content[pos:])
+    return fix_imports(b"".join(parts))
+
+
+# worker-local read buffer, grown monotonically to the largest file seen;
+# reading through a memoryview avoids a fresh MB-scale allocation per file
+_read_buf = bytearray(1 << 20)
+
+
+def process_file(filepath: str, mode: str = "vitest") -> "tuple[str, bool]":
+    size = os.path.getsize(filepath)
+    if size > len(_read_buf):
+        _read_buf.extend(b"\0" * (size - len(_read_buf)))
+    content = memoryview(_read_buf)[:size]
+    with open(filepath, "rb") as f:
+        read = 0
+        while read < size:
+            n = f.readinto(content[read:])
+            if not n:
+                break
+            read += n
+    content = content[:read]
+    converted = convert(content, mode)
+    if converted is not content:
+        # converted is already bytes, so one raw write covers the whole file
+        # with no buffered-writer state machine in between
+        tmp = filepath + ".tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, converted)
+        finally:
+            os.close(fd)
+        os.replace(tmp, filepath)
+        return filepath, True
+    return filepath, False
+
+
+def iter_specs(root):
+    # scandir uses the cached dirent type, so no extra stat per entry, and
+    # yielding lazily lets the pool start before discovery finishes
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_specs(entry.path)
+        elif entry.name.endswith(".spec.ts"):
+            yield entry.path
+
+
+def _rg_candidates(root):
+    # one SIMD-accelerated ripgrep pass replaces an open+scan per spec file
+    hits = subprocess.run(
+        ["rg", "-l", "--no-messages", "-g", "*.spec.ts", r"\bit\(", root],
+        stdout=subprocess.PIPE,
+        check=False,
+    ).stdout.decode().splitlines()
+    if not hits:
+        return []
+    done = set(
+        subprocess.run(
+            ["rg", "-l", "--no-messages", r"it\.effect\(", *hits],
+            stdout=subprocess.PIPE,
+            check=False,
+        ).stdout.decode().splitlines()
+    )
+    return [filepath for filepath in hits if filepath not in done]
+
+
+def _cache_hit(filepath, cache, mode):
+    st = os.stat(filepath)
+    if st.st_size == 0:
+        return True
+    # unchanged since the last run: the previous verdict still holds, but
+    # only for the mode that produced it (the modes accept different files)
+    entry = cache.get(f"{mode}:{filepath}")
+    return bool(entry) and entry[0] == st.st_mtime_ns and entry[1] == st.st_size
+
+
+def iter_candidates(root, cache, mode):
+    if shutil.which("rg"):
+        for filepath in _rg_candidates(root):
+            if not _cache_hit(filepath, cache, mode):
+                yield filepath
+        return
+    for filepath in iter_specs(root):
+        if _cache_hit(filepath, cache, mode):
+            continue
+        # mmap keeps the accept/reject scan in the page cache: no Python-heap
+        # copy and no UTF-8 decode for rejected files
+        with open(filepath, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                wanted = mm.find(b"it(") >= 0 and mm.find(b"it.effect(") < 0
+            finally:
+                mm.close()
+        if wanted:
+            yield filepath
+        else:
+            st = os.stat(filepath)
+            cache[f"{mode}:{filepath}"] = [st.st_mtime_ns, st.st_size, False]
+
+
+def _load_cache():
+    try:
+        with open(_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    tmp = _CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, _CACHE_FILE)
+
+
+def main(base_dir, mode="vitest"):
+    cache = _load_cache()
+    total = 0
+    converted_count = 0
+    with Pool() as pool:
+        for filepath, changed in pool.imap_unordered(
+            partial(process_file, mode=mode),
+            iter_candidates(base_dir, cache, mode),
+            chunksize=16,
+        ):
+            total += 1
+            st = os.stat(filepath)
+            cache[f"{mode}:{filepath}"] = [st.st_mtime_ns, st.st_size, changed]
+            if changed:
+                print(f"converted: {filepath}")
+                converted_count += 1
+    _save_cache(cache)
+    print(f"{converted_count}/{total} files converted")
@@ -0,0 +1,14 @@
+"""Entry point: python -m convert_tests [--mode=simple|vitest] [base_dir]."""
+
+import argparse
+
+from convert_tests import main
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert it() specs to @effect/vitest it.effect() specs"
+    )
+    parser.add_argument("base_dir", nargs="?", default="src")
+    parser.add_argument("--mode", choices=("simple", "vitest"), default="vitest")
+    args = parser.parse_args()
+    main(args.base_dir, mode=args.mode)
@@ -0,0 +1,21 @@
+"""Optional AOT build for the convert_tests package.
+
+The converter runs fine interpreted; compiling it with mypyc removes the
+bytecode-dispatch overhead from the string-heavy hot path. Build with
+
+    pip install mypy setuptools
+    python setup.py build_ext --inplace
+
+which drops a convert_tests C extension next to the package so the
+wrappers and `python -m convert_tests` pick it up automatically.
+"""
+
+from setuptools import setup
+
+from mypyc.build import mypycify
+
+setup(
+    name="convert-tests",
+    packages=["convert_tests"],
+    ext_modules=mypycify(["convert_tests/__init__.py"]),
+)